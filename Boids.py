@@ -3,8 +3,50 @@
 import pygame
 import numpy as np
 import math
+import os
 import random
 import sys
+from concurrent.futures import ThreadPoolExecutor
+
+# Numba is optional: when available the flocking kernel is JIT-compiled
+# and parallelized, otherwise the NumPy path is used
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+# A Cython build of the same kernel (python setup.py build_ext --inplace)
+# covers deployments where an LLVM/numba toolchain is not an option
+try:
+    from flock_kernel import flock_kernel_cython
+    HAS_CYTHON = True
+except ImportError:
+    HAS_CYTHON = False
+
+# With a CUDA-capable GPU the flock step can run one thread per boid;
+# only worth the transfer overhead for large flocks
+try:
+    from numba import cuda
+    HAS_CUDA = cuda.is_available()
+except Exception:
+    HAS_CUDA = False
+
+CUDA_MIN_BOIDS = 4096
+
+# The NumPy fallback splits the cell loop across a small thread pool for
+# large flocks; each cell writes disjoint row slices, so no locking is
+# needed, and NumPy releases the GIL inside the per-cell array ops
+FLOCK_THREADS = min(os.cpu_count() or 1, 8)
+THREADED_MIN_BOIDS = 512
+_flock_pool = None
+
+
+def _get_flock_pool():
+    global _flock_pool
+    if _flock_pool is None:
+        _flock_pool = ThreadPoolExecutor(max_workers=FLOCK_THREADS)
+    return _flock_pool
 
 # Initialize pygame
 pygame.init()
@@ -14,6 +56,11 @@ WIDTH, HEIGHT = 1200, 800
 screen = pygame.display.set_mode((WIDTH, HEIGHT))
 pygame.display.set_caption("Boids Algorithm - Flocking Simulation with Parameter Control")
 
+# Shared surface for all alpha-blended overlay primitives; drawing them
+# here and blitting once per frame gives a single blend pass (plain
+# pygame.draw calls on the screen ignore the alpha channel anyway)
+OVERLAY = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+
 # Color definitions
 BACKGROUND = (10, 10, 30)
 BOID_COLOR = (100, 200, 255)
@@ -52,172 +99,684 @@ param_ranges = {
 font = pygame.font.SysFont("cambriamath", 24)
 title_font = pygame.font.SysFont("cambriamath", 36)
 
+# Arrow headings are quantized to this many buckets (2*pi/128 ~ 2.8
+# degrees) and the rotated sprite for each bucket is rendered once, so
+# drawing a boid becomes a cached blit instead of polygon rasterization
+ARROW_BUCKETS = 128
+_arrow_cache = {}
+
 
-class Boid:
-    def __init__(self, x, y):
-        self.position = np.array([float(x), float(y)])
+def get_arrow(bucket):
+    surf = _arrow_cache.get(bucket)
+    if surf is None:
+        length = 15
+        # Base sprite points right, tail at the surface center so the
+        # rotated blit keeps the tail on the boid position
+        base = pygame.Surface((34, 34), pygame.SRCALPHA)
+        tail = (17, 17)
+        tip = (17 + length, 17)
+        left = (tip[0] - math.cos(-math.pi / 6) * length / 2,
+                tip[1] - math.sin(-math.pi / 6) * length / 2)
+        right = (tip[0] - math.cos(math.pi / 6) * length / 2,
+                 tip[1] - math.sin(math.pi / 6) * length / 2)
+        pygame.draw.polygon(base, ARROW_COLOR, [tip, left, tail, right])
+        pygame.draw.line(base, ARROW_COLOR, tail, tip, 2)
+
+        # pygame rotates counterclockwise, screen angles run clockwise
+        surf = pygame.transform.rotate(base, -bucket * 360 / ARROW_BUCKETS)
+        _arrow_cache[bucket] = surf
+    return surf
+
+
+class SpatialGrid:
+    """Uniform grid over boid positions. With cell size equal to the
+    perception radius, every potential neighbor of a boid lies in the 3x3
+    block of cells around it, so the pair search drops from O(N^2) to
+    O(N*k) where k is the average occupancy of nine cells.
+
+    The grid is "coherent": rebuild() returns a permutation that sorts
+    the boid arrays by cell id, after which each cell's boids occupy a
+    contiguous slice [cell_start[c]:cell_end[c]) and neighbor gathers
+    become cache-friendly slicing instead of scattered loads."""
+
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.shape = (0, 0)
+        self.cell_start = np.empty(0, dtype=np.intp)
+        self.cell_end = np.empty(0, dtype=np.intp)
+        self.occupied = np.empty(0, dtype=np.intp)
+
+    def rebuild(self, positions):
+        cs = self.cell_size
+        w = max(int(WIDTH // cs) + 1, 1)
+        h = max(int(HEIGHT // cs) + 1, 1)
+        self.shape = (w, h)
+
+        # Boids pushed past the window edge are clamped into border cells
+        cx = np.clip((positions[:, 0] // cs).astype(np.intp), 0, w - 1)
+        cy = np.clip((positions[:, 1] // cs).astype(np.intp), 0, h - 1)
+        cid = cx * h + cy
+
+        order = np.argsort(cid, kind="stable")
+        cid = cid[order]
+        bounds = np.searchsorted(cid, np.arange(w * h + 1))
+        self.cell_start = bounds[:-1]
+        self.cell_end = bounds[1:]
+        self.occupied = np.unique(cid)
+        return order
+
+    def candidates(self, c):
+        # Indices of all boids in the 3x3 neighborhood of cell c. Cell ids
+        # are x-major, so the three cells in a column are consecutive and
+        # each column contributes one contiguous index range.
+        w, h = self.shape
+        cx, cy = divmod(c, h)
+        lo = max(cy - 1, 0)
+        hi = min(cy + 1, h - 1)
+        parts = []
+        for x in (cx - 1, cx, cx + 1):
+            if 0 <= x < w:
+                a = self.cell_start[x * h + lo]
+                b = self.cell_end[x * h + hi]
+                if a < b:
+                    parts.append(np.arange(a, b))
+        if not parts:
+            return np.empty(0, dtype=np.intp)
+        return np.concatenate(parts)
+
+
+if HAS_NUMBA:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def flock_kernel(pos, vel, accel, cell_start, cell_end, grid_w, grid_h,
+                     cs, R, R_sep, vmax, w_sep, w_ali, w_coh):
+        """Fused separation/alignment/cohesion pass: one trip over each
+        boid's grid candidates accumulating scalar sums, no temporaries.
+        prange spreads boids across cores; scalar math lets LLVM
+        autovectorize the inner loop."""
+        n = pos.shape[0]
+        R2 = R * R
+        Rsep2 = R_sep * R_sep
+        # float32 constants so the scalar math never promotes to double
+        zero = np.float32(0.0)
+        one = np.float32(1.0)
+        eps = np.float32(1e-5)
+        fmax = np.float32(0.2)
+        fmax2 = np.float32(0.04)
+        for i in prange(n):
+            px = pos[i, 0]
+            py = pos[i, 1]
+            vx = vel[i, 0]
+            vy = vel[i, 1]
+
+            cx = int(px // cs)
+            cy = int(py // cs)
+            if cx < 0:
+                cx = 0
+            elif cx > grid_w - 1:
+                cx = grid_w - 1
+            if cy < 0:
+                cy = 0
+            elif cy > grid_h - 1:
+                cy = grid_h - 1
+
+            sep_x = zero
+            sep_y = zero
+            ali_x = zero
+            ali_y = zero
+            coh_x = zero
+            coh_y = zero
+            cnt_sep = zero
+            cnt_ali = zero
+
+            for x in range(cx - 1, cx + 2):
+                if x < 0 or x >= grid_w:
+                    continue
+                for y in range(cy - 1, cy + 2):
+                    if y < 0 or y >= grid_h:
+                        continue
+                    c = x * grid_h + y
+                    for j in range(cell_start[c], cell_end[c]):
+                        dx = pos[j, 0] - px
+                        dy = pos[j, 1] - py
+                        d2 = dx * dx + dy * dy
+                        if d2 <= 0.0 or d2 >= R2:
+                            continue
+                        ali_x += vel[j, 0]
+                        ali_y += vel[j, 1]
+                        coh_x += pos[j, 0]
+                        coh_y += pos[j, 1]
+                        cnt_ali += one
+                        if d2 < Rsep2:
+                            inv = one / (d2 + eps)
+                            sep_x -= dx * inv
+                            sep_y -= dy * inv
+                            cnt_sep += one
+
+            ax = zero
+            ay = zero
+
+            if cnt_sep > zero:
+                sx = sep_x / cnt_sep
+                sy = sep_y / cnt_sep
+                n2 = sx * sx + sy * sy
+                if n2 > zero:
+                    s = vmax / math.sqrt(n2)
+                    sx *= s
+                    sy *= s
+                sx -= vx
+                sy -= vy
+                n2 = sx * sx + sy * sy
+                if n2 > fmax2:  # limit to fixed max force 0.2
+                    s = fmax / math.sqrt(n2)
+                    sx *= s
+                    sy *= s
+                ax += sx * w_sep
+                ay += sy * w_sep
+
+            if cnt_ali > zero:
+                sx = ali_x / cnt_ali
+                sy = ali_y / cnt_ali
+                n2 = sx * sx + sy * sy
+                if n2 > zero:
+                    s = vmax / math.sqrt(n2)
+                    sx *= s
+                    sy *= s
+                sx -= vx
+                sy -= vy
+                n2 = sx * sx + sy * sy
+                if n2 > fmax2:
+                    s = fmax / math.sqrt(n2)
+                    sx *= s
+                    sy *= s
+                ax += sx * w_ali
+                ay += sy * w_ali
+
+                sx = coh_x / cnt_ali - px
+                sy = coh_y / cnt_ali - py
+                n2 = sx * sx + sy * sy
+                if n2 > zero:
+                    s = vmax / math.sqrt(n2)
+                    sx *= s
+                    sy *= s
+                sx -= vx
+                sy -= vy
+                n2 = sx * sx + sy * sy
+                if n2 > fmax2:
+                    s = fmax / math.sqrt(n2)
+                    sx *= s
+                    sy *= s
+                ax += sx * w_coh
+                ay += sy * w_coh
+
+            accel[i, 0] += ax
+            accel[i, 1] += ay
+
+
+if HAS_CUDA:
+    @cuda.jit
+    def flock_kernel_cuda(pos, vel, accel, cell_start, cell_end,
+                          grid_w, grid_h, cs, R, R_sep, vmax,
+                          w_sep, w_ali, w_coh):
+        """One thread per boid; same fused-rule math as flock_kernel but
+        with the boid loop replaced by the CUDA launch grid."""
+        i = cuda.grid(1)
+        if i >= pos.shape[0]:
+            return
+
+        R2 = R * R
+        Rsep2 = R_sep * R_sep
+        # float32 constants so the scalar math never promotes to double
+        zero = np.float32(0.0)
+        one = np.float32(1.0)
+        eps = np.float32(1e-5)
+        fmax = np.float32(0.2)
+        fmax2 = np.float32(0.04)
+        px = pos[i, 0]
+        py = pos[i, 1]
+        vx = vel[i, 0]
+        vy = vel[i, 1]
+
+        cx = int(px // cs)
+        cy = int(py // cs)
+        if cx < 0:
+            cx = 0
+        elif cx > grid_w - 1:
+            cx = grid_w - 1
+        if cy < 0:
+            cy = 0
+        elif cy > grid_h - 1:
+            cy = grid_h - 1
+
+        sep_x = zero
+        sep_y = zero
+        ali_x = zero
+        ali_y = zero
+        coh_x = zero
+        coh_y = zero
+        cnt_sep = zero
+        cnt_ali = zero
+
+        for x in range(cx - 1, cx + 2):
+            if x < 0 or x >= grid_w:
+                continue
+            for y in range(cy - 1, cy + 2):
+                if y < 0 or y >= grid_h:
+                    continue
+                c = x * grid_h + y
+                for j in range(cell_start[c], cell_end[c]):
+                    dx = pos[j, 0] - px
+                    dy = pos[j, 1] - py
+                    d2 = dx * dx + dy * dy
+                    if d2 <= 0.0 or d2 >= R2:
+                        continue
+                    ali_x += vel[j, 0]
+                    ali_y += vel[j, 1]
+                    coh_x += pos[j, 0]
+                    coh_y += pos[j, 1]
+                    cnt_ali += one
+                    if d2 < Rsep2:
+                        inv = one / (d2 + eps)
+                        sep_x -= dx * inv
+                        sep_y -= dy * inv
+                        cnt_sep += one
+
+        ax = zero
+        ay = zero
+
+        if cnt_sep > zero:
+            sx = sep_x / cnt_sep
+            sy = sep_y / cnt_sep
+            n2 = sx * sx + sy * sy
+            if n2 > zero:
+                s = vmax / math.sqrt(n2)
+                sx *= s
+                sy *= s
+            sx -= vx
+            sy -= vy
+            n2 = sx * sx + sy * sy
+            if n2 > fmax2:  # limit to fixed max force 0.2
+                s = fmax / math.sqrt(n2)
+                sx *= s
+                sy *= s
+            ax += sx * w_sep
+            ay += sy * w_sep
+
+        if cnt_ali > zero:
+            sx = ali_x / cnt_ali
+            sy = ali_y / cnt_ali
+            n2 = sx * sx + sy * sy
+            if n2 > zero:
+                s = vmax / math.sqrt(n2)
+                sx *= s
+                sy *= s
+            sx -= vx
+            sy -= vy
+            n2 = sx * sx + sy * sy
+            if n2 > fmax2:
+                s = fmax / math.sqrt(n2)
+                sx *= s
+                sy *= s
+            ax += sx * w_ali
+            ay += sy * w_ali
+
+            sx = coh_x / cnt_ali - px
+            sy = coh_y / cnt_ali - py
+            n2 = sx * sx + sy * sy
+            if n2 > zero:
+                s = vmax / math.sqrt(n2)
+                sx *= s
+                sy *= s
+            sx -= vx
+            sy -= vy
+            n2 = sx * sx + sy * sy
+            if n2 > fmax2:
+                s = fmax / math.sqrt(n2)
+                sx *= s
+                sy *= s
+            ax += sx * w_coh
+            ay += sy * w_coh
+
+        accel[i, 0] += ax
+        accel[i, 1] += ay
+
+
+class Flock:
+    """All boid state stored as structure-of-arrays so the flocking rules
+    run as batched NumPy operations instead of per-pair Python loops."""
+
+    def __init__(self):
+        self.count = 0
+        self.positions = np.zeros((0, 2), dtype=np.float32)
+        self.velocities = np.zeros((0, 2), dtype=np.float32)
+        self.accelerations = np.zeros((0, 2), dtype=np.float32)
+        self.grid = SpatialGrid(params["perception_radius"])
+        # Reused buffer for integer screen positions
+        self._ipos = np.empty((0, 2), dtype=np.int32)
+
+    def add(self, x, y):
         angle = random.uniform(0, 2 * math.pi)
-        self.velocity = np.array([math.cos(angle), math.sin(angle)]) * params["max_speed"]
-        self.acceleration = np.array([0.0, 0.0])
-        self.size = 6
-        self.neighbors = []
-
-    def update(self):
-        # Update velocity
-        self.velocity += self.acceleration
-        # Limit maximum speed
-        speed = np.linalg.norm(self.velocity)
-        if speed > params["max_speed"]:
-            self.velocity = (self.velocity / speed) * params["max_speed"]
-
-        # Update position
-        self.position += self.velocity
-        self.acceleration = np.array([0.0, 0.0])
-
-        # Boundary handling
-        self.handle_boundaries()
-
-    def apply_force(self, force):
-        self.acceleration += force
-
-    def handle_boundaries(self):
+        position = np.array([[float(x), float(y)]], dtype=np.float32)
+        velocity = np.array([[math.cos(angle), math.sin(angle)]],
+                            dtype=np.float32) * params["max_speed"]
+        self.positions = np.vstack([self.positions, position])
+        self.velocities = np.vstack([self.velocities, velocity])
+        self.accelerations = np.vstack([self.accelerations,
+                                        np.zeros((1, 2), dtype=np.float32)])
+        self.count += 1
+
+    def clear(self):
+        self.__init__()
+
+    def flock_all(self):
+        if self.count < 2:
+            return
+
+        # Bin boids so each one is only compared against the 3x3 cell
+        # neighborhood instead of the whole flock. Sorting the arrays by
+        # cell id keeps each cell's boids contiguous in memory.
+        self.grid.cell_size = params["perception_radius"]
+        order = self.grid.rebuild(self.positions)
+        self.positions = self.positions[order]
+        self.velocities = self.velocities[order]
+        self.accelerations = self.accelerations[order]
+
+        if HAS_CUDA and self.count >= CUDA_MIN_BOIDS:
+            self._flock_cuda()
+        elif HAS_NUMBA:
+            self._flock_numba()
+        elif HAS_CYTHON:
+            self._flock_cython()
+        else:
+            self._flock_numpy()
+
+    def _flock_cuda(self):
+        grid_w, grid_h = self.grid.shape
+        d_pos = cuda.to_device(self.positions)
+        d_vel = cuda.to_device(self.velocities)
+        d_accel = cuda.to_device(self.accelerations)
+        d_start = cuda.to_device(self.grid.cell_start)
+        d_end = cuda.to_device(self.grid.cell_end)
+
+        threads = 128
+        blocks = (self.count + threads - 1) // threads
+        flock_kernel_cuda[blocks, threads](
+            d_pos, d_vel, d_accel, d_start, d_end, grid_w, grid_h,
+            np.float32(self.grid.cell_size),
+            np.float32(params["perception_radius"]),
+            np.float32(params["separation_radius"]),
+            np.float32(params["max_speed"]),
+            np.float32(params["separation_weight"]),
+            np.float32(params["alignment_weight"]),
+            np.float32(params["cohesion_weight"]))
+
+        # Only the accelerations come back; positions/velocities are
+        # integrated on the host
+        d_accel.copy_to_host(self.accelerations)
+
+    def _flock_cython(self):
+        grid_w, grid_h = self.grid.shape
+        flock_kernel_cython(self.positions, self.velocities,
+                            self.accelerations,
+                            self.grid.cell_start, self.grid.cell_end,
+                            grid_w, grid_h,
+                            np.float32(self.grid.cell_size),
+                            np.float32(params["perception_radius"]),
+                            np.float32(params["separation_radius"]),
+                            np.float32(params["max_speed"]),
+                            np.float32(params["separation_weight"]),
+                            np.float32(params["alignment_weight"]),
+                            np.float32(params["cohesion_weight"]))
+
+    def _flock_numba(self):
+        grid_w, grid_h = self.grid.shape
+        flock_kernel(self.positions, self.velocities, self.accelerations,
+                     self.grid.cell_start, self.grid.cell_end,
+                     grid_w, grid_h,
+                     np.float32(self.grid.cell_size),
+                     np.float32(params["perception_radius"]),
+                     np.float32(params["separation_radius"]),
+                     np.float32(params["max_speed"]),
+                     np.float32(params["separation_weight"]),
+                     np.float32(params["alignment_weight"]),
+                     np.float32(params["cohesion_weight"]))
+
+    def _flock_numpy(self):
+        n = self.count
+        pos = self.positions
+        vel = self.velocities
+
+        # Hoist dict lookups out of the cell loop; radii are compared
+        # squared so the cell pass never needs a sqrt
+        R2 = np.float32(params["perception_radius"] ** 2)
+        Rsep2 = np.float32(params["separation_radius"] ** 2)
+        vmax = params["max_speed"]
+
+        # Pass 1: build the neighbor adjacency once as CSR
+        # (neighbor_idx/neighbor_ptr); boids are cell-sorted, so walking
+        # the occupied cells in order emits pairs grouped by boid
+        count_perc = np.zeros(n, dtype=np.intp)
+        occupied = self.grid.occupied
+        if n >= THREADED_MIN_BOIDS and FLOCK_THREADS > 1 and len(occupied) > 1:
+            # Cells write disjoint count ranges and each chunk returns
+            # its own pair arrays, so chunks of the cell list can be
+            # processed concurrently
+            pool = _get_flock_pool()
+            futures = [pool.submit(self._collect_pairs, chunk, pos, R2,
+                                   count_perc)
+                       for chunk in np.array_split(occupied, FLOCK_THREADS)
+                       if len(chunk)]
+            parts = [part for future in futures for part in future.result()]
+        else:
+            parts = self._collect_pairs(occupied, pos, R2, count_perc)
+
+        ptr = np.zeros(n + 1, dtype=np.intp)
+        np.cumsum(count_perc, out=ptr[1:])
+        if ptr[-1] == 0:
+            return
+        idx = np.concatenate(parts)
+
+        # Pass 2: all three rules share the one pair list. reduceat
+        # cannot express empty segments (and a start equal to idx.size
+        # is out of bounds), so reduce over the active rows' offsets
+        # only and scatter the sums back; rows without neighbors own no
+        # pairs, so consecutive active starts bound exact segments.
+        active = count_perc > 0
+        starts = ptr[:-1][active]
+        row = np.repeat(np.arange(n), count_perc)
+
+        diff = pos[row] - pos[idx]
+        d2 = diff[:, 0] ** 2 + diff[:, 1] ** 2
+
+        # Separation: avoid crowding; the 1/d^2 falloff wants the
+        # squared distance anyway
+        inv = (d2 < Rsep2) / (d2 + np.float32(1e-5))  # Avoid division by zero
+        separation = np.zeros((n, 2), dtype=np.float32)
+        separation[active] = np.add.reduceat(diff * inv[:, None], starts,
+                                             axis=0)
+        count_sep = np.zeros(n, dtype=np.float32)
+        count_sep[active] = np.add.reduceat((d2 < Rsep2).astype(np.float32),
+                                            starts)
+
+        # Alignment: steer toward average heading
+        alignment = np.zeros((n, 2), dtype=np.float32)
+        alignment[active] = np.add.reduceat(vel[idx], starts, axis=0)
+
+        # Cohesion: steer toward average position
+        cohesion = np.zeros((n, 2), dtype=np.float32)
+        cohesion[active] = np.add.reduceat(pos[idx], starts, axis=0)
+
+        safe_perc = count_perc.clip(min=1)[:, None]
+        safe_sep = count_sep.clip(min=1)[:, None]
+
+        separation /= safe_sep
+        alignment /= safe_perc
+        cohesion = cohesion / safe_perc - pos
+
+        self.accelerations += self._steer(separation, count_sep > 0,
+                                          params["separation_weight"], vmax)
+        self.accelerations += self._steer(alignment, active,
+                                          params["alignment_weight"], vmax)
+        self.accelerations += self._steer(cohesion, active,
+                                          params["cohesion_weight"], vmax)
+
+    def _collect_pairs(self, cells, pos, R2, count_perc):
+        parts = []
+        for c in cells:
+            start = self.grid.cell_start[c]
+            end = self.grid.cell_end[c]
+            cand = self.grid.candidates(c)
+
+            # Squared pairwise distances from this cell's boids to all
+            # candidates; both sides read contiguous float32 blocks and
+            # the radius tests never take a sqrt
+            diff = pos[start:end, None, :] - pos[cand][None, :, :]
+            d2 = diff[:, :, 0] ** 2 + diff[:, :, 1] ** 2
+
+            mask = (d2 < R2) & (d2 > 0)
+            count_perc[start:end] = mask.sum(axis=1)
+            parts.append(cand[np.nonzero(mask)[1]])
+        return parts
+
+    def neighbors_of(self, i):
+        # Neighbor indices of boid i, computed on demand for the overlay
+        # (the fused kernel does not materialize neighbor lists)
+        if self.count < 2 or not len(self.grid.occupied):
+            return np.empty(0, dtype=np.intp)
+        w, h = self.grid.shape
+        cs = self.grid.cell_size
+        cx = min(max(int(self.positions[i, 0] // cs), 0), w - 1)
+        cy = min(max(int(self.positions[i, 1] // cs), 0), h - 1)
+        cand = self.grid.candidates(cx * h + cy)
+        diff = self.positions[cand] - self.positions[i]
+        d2 = diff[:, 0] ** 2 + diff[:, 1] ** 2
+        return cand[(d2 < params["perception_radius"] ** 2) & (d2 > 0)]
+
+    def _steer(self, desired, active, weight, vmax):
+        # Scale desired direction to max speed. Each normalization is a
+        # single scale factor applied in one multiply, rather than
+        # normalize()+limit() both re-running np.linalg.norm with its
+        # generic dispatch, fixup writes and extra temporaries.
+        norm = np.sqrt(desired[:, 0] ** 2 + desired[:, 1] ** 2)
+        scale = np.divide(vmax, norm, out=np.zeros_like(norm),
+                          where=norm > 0)
+        steer = desired * scale[:, None]
+        steer -= self.velocities
+        # Limit steering force (fixed max force 0.2); the division only
+        # runs for rows actually over the limit, and the rule weight
+        # folds into the same factor
+        n2 = steer[:, 0] ** 2 + steer[:, 1] ** 2
+        factor = np.divide(0.2, np.sqrt(n2), out=np.ones_like(n2),
+                           where=n2 > np.float32(0.04))
+        steer *= (factor * weight)[:, None]
+        steer[~active] = 0
+        return steer
+
+    def update_all(self):
+        if self.count == 0:
+            return
+
+        pos = self.positions
+        vel = self.velocities
+        acc = self.accelerations
+        vmax = np.float32(params["max_speed"])
+        turn_factor = np.float32(params["edge_force"])
         margin = 50  # Fixed margin for simplicity
-        turn_factor = params["edge_force"]
-
-        if self.position[0] < margin:
-            self.velocity[0] += turn_factor
-        if self.position[0] > WIDTH - margin:
-            self.velocity[0] -= turn_factor
-        if self.position[1] < margin:
-            self.velocity[1] += turn_factor
-        if self.position[1] > HEIGHT - margin:
-            self.velocity[1] -= turn_factor
-
-    def flock(self, boids):
-        self.neighbors = []
-        separation = np.array([0.0, 0.0])
-        alignment = np.array([0.0, 0.0])
-        cohesion = np.array([0.0, 0.0])
-
-        total_separation = 0
-        total_alignment = 0
-        total_cohesion = 0
-
-        for other in boids:
-            if other is self:
-                continue
-
-            distance = np.linalg.norm(self.position - other.position)
-
-            if distance < params["perception_radius"]:
-                self.neighbors.append(other)
-
-                # Separation: avoid crowding
-                if distance < params["separation_radius"]:
-                    diff = self.position - other.position
-                    diff = diff / (distance * distance + 1e-5)  # Avoid division by zero
-                    separation += diff
-                    total_separation += 1
-
-                # Alignment: steer toward average heading
-                alignment += other.velocity
-                total_alignment += 1
-
-                # Cohesion: steer toward average position
-                cohesion += other.position
-                total_cohesion += 1
-
-        # Apply separation rule
-        if total_separation > 0:
-            separation = separation / total_separation
-            separation = self.normalize(separation) * params["max_speed"]
-            separation -= self.velocity
-            separation = self.limit(separation, 0.2)  # Fixed max force
-            separation *= params["separation_weight"]
-            self.apply_force(separation)
-
-        # Apply alignment rule
-        if total_alignment > 0:
-            alignment = alignment / total_alignment
-            alignment = self.normalize(alignment) * params["max_speed"]
-            alignment -= self.velocity
-            alignment = self.limit(alignment, 0.2)  # Fixed max force
-            alignment *= params["alignment_weight"]
-            self.apply_force(alignment)
-
-        # Apply cohesion rule
-        if total_cohesion > 0:
-            cohesion = cohesion / total_cohesion
-            cohesion -= self.position
-            cohesion = self.normalize(cohesion) * params["max_speed"]
-            cohesion -= self.velocity
-            cohesion = self.limit(cohesion, 0.2)  # Fixed max force
-            cohesion *= params["cohesion_weight"]
-            self.apply_force(cohesion)
-
-    def normalize(self, vector):
-        norm = np.linalg.norm(vector)
-        if norm > 0:
-            return vector / norm
-        return vector
-
-    def limit(self, vector, max_value):
-        norm = np.linalg.norm(vector)
-        if norm > max_value:
-            return (vector / norm) * max_value
-        return vector
 
-    def draw(self, screen):
+        # Integrate, limit speed, move and steer off the edges as one
+        # fused vectorized pass over the contiguous arrays — the whole
+        # update is memory-bound once flocking is kernelized
+        vel += acc
+        speed = np.linalg.norm(vel, axis=1)
+        over = speed > vmax
+        if over.any():
+            vel[over] *= (vmax / speed[over])[:, None]
+        pos += vel
+
+        # Boundary handling: +1 inside the left/top margin, -1 inside
+        # the right/bottom margin, 0 elsewhere
+        vel[:, 0] += turn_factor * ((pos[:, 0] < margin).astype(np.float32)
+                                    - (pos[:, 0] > WIDTH - margin).astype(np.float32))
+        vel[:, 1] += turn_factor * ((pos[:, 1] < margin).astype(np.float32)
+                                    - (pos[:, 1] > HEIGHT - margin).astype(np.float32))
+
+        # Zero accelerations in place rather than reallocating
+        acc.fill(0.0)
+
+    def _int_positions(self):
+        # Cast positions into a reused int32 buffer — a memcpy-style
+        # assignment instead of a fresh astype(int) array every frame
+        if self._ipos.shape[0] != self.count:
+            self._ipos = np.empty((self.count, 2), dtype=np.int32)
+        self._ipos[...] = self.positions
+        return self._ipos
+
+    def nearest_to(self, x, y):
+        # Index of the boid closest to (x, y), -1 when the flock is empty
+        if self.count == 0:
+            return -1
+        d2 = (self.positions[:, 0] - x) ** 2 + (self.positions[:, 1] - y) ** 2
+        return int(np.argmin(d2))
+
+    def draw_all(self, screen, show_visuals, hover_idx=-1):
+        n = self.count
+        if n == 0:
+            return
+
+        pos = self.positions
+        vel = self.velocities
+        ipos = self._int_positions()
+
+        # Headings computed in one vectorized batch instead of atan2 per
+        # boid, then quantized to sprite-cache buckets
+        length = 15
+        angles = np.arctan2(vel[:, 1], vel[:, 0])
+        buckets = (angles * (ARROW_BUCKETS / (2 * math.pi))).astype(int) \
+            % ARROW_BUCKETS
+
+        if not show_visuals:
+            # Simplified arrows without visuals
+            tips = pos + np.stack([np.cos(angles), np.sin(angles)],
+                                  axis=1) * length
+            # pygame wants plain number pairs, not float32 rows; one
+            # C-level tolist() beats converting inside the loop
+            tips_l = tips.tolist()
+            for i in range(n):
+                pygame.draw.line(screen, ARROW_COLOR, ipos[i], tips_l[i], 2)
+                pygame.draw.circle(screen, ARROW_COLOR, ipos[i], 3)
+            return
+
+        # Drawing every boid's perception circle and neighbor lines is
+        # O(N + total neighbors) SDL calls; showing the overlay for just
+        # the boid under the mouse keeps the pedagogy and drops the cost
+        # to O(1)
+        if 0 <= hover_idx < n:
+            OVERLAY.fill((0, 0, 0, 0))
+            self._draw_overlay(OVERLAY, hover_idx, ipos)
+            screen.blit(OVERLAY, (0, 0))
+
+        for i in range(n):
+            # Arrow as a cached pre-rotated sprite; the tail sits at the
+            # sprite center, i.e. on the boid position
+            surf = get_arrow(buckets[i])
+            screen.blit(surf, surf.get_rect(center=(ipos[i, 0], ipos[i, 1])))
+
+    def _draw_overlay(self, surface, i, ipos):
         # Draw perception range
-        pygame.draw.circle(screen, RANGE_COLOR, self.position.astype(int),
+        pygame.draw.circle(surface, RANGE_COLOR, ipos[i],
                            params["perception_radius"], 1)
 
         # Draw neighbor connections
-        for neighbor in self.neighbors:
-            pygame.draw.line(screen, NEIGHBOR_COLOR,
-                             self.position.astype(int),
-                             neighbor.position.astype(int), 1)
-
-        # Draw arrow
-        angle = math.atan2(self.velocity[1], self.velocity[0])
-        length = 15
-
-        # Arrow tip
-        end_point = (
-            self.position[0] + math.cos(angle) * length,
-            self.position[1] + math.sin(angle) * length
-        )
-
-        # Arrow side points
-        arrow_left = (
-            end_point[0] - math.cos(angle - math.pi / 6) * length / 2,
-            end_point[1] - math.sin(angle - math.pi / 6) * length / 2
-        )
-
-        arrow_right = (
-            end_point[0] - math.cos(angle + math.pi / 6) * length / 2,
-            end_point[1] - math.sin(angle + math.pi / 6) * length / 2
-        )
-
-        # Draw arrow polygon
-        pygame.draw.polygon(screen, ARROW_COLOR, [
-            end_point,
-            arrow_left,
-            self.position,
-            arrow_right
-        ])
-
-        # Draw arrow body
-        pygame.draw.line(screen, ARROW_COLOR,
-                         self.position.astype(int),
-                         end_point, 2)
+        for j in self.neighbors_of(i):
+            pygame.draw.line(surface, NEIGHBOR_COLOR, ipos[i], ipos[j], 1)
 
 
 def create_boids(num=None):
-    if num is None:
-        return []
-    return [Boid(random.randint(50, WIDTH - 50),
-                 random.randint(50, HEIGHT - 50)) for _ in range(num)]
+    flock = Flock()
+    if num is not None:
+        for _ in range(num):
+            flock.add(random.randint(50, WIDTH - 50),
+                      random.randint(50, HEIGHT - 50))
+    return flock
 
 
 class Slider:
@@ -232,6 +791,15 @@ class Slider:
         # Calculate handle position
         self.handle_radius = 10
         self.handle_x = self.rect.x + (self.value - self.min_val) / (self.max_val - self.min_val) * self.rect.width
+        # Hit area padded so the handle can be grabbed where it pokes
+        # past the track
+        self.hit_rect = self.rect.inflate(self.handle_radius * 2,
+                                          self.handle_radius * 2)
+
+        # Label surface cache; font rasterization only reruns when the
+        # displayed value actually changes
+        self._cached_val = None
+        self._cached_surf = None
 
     def draw(self, screen):
         # Draw slider background
@@ -246,25 +814,33 @@ class Slider:
         handle_pos = (self.handle_x, self.rect.y + self.rect.height // 2)
         pygame.draw.circle(screen, SLIDER_HANDLE, handle_pos, self.handle_radius)
 
-        # Draw label and value
-        label_text = font.render(f"{self.label}: {self.value:.2f}", True, TEXT_COLOR)
-        screen.blit(label_text, (self.rect.x, self.rect.y - 25))
+        # Draw label and value; re-render only when the displayed value
+        # changes (i.e. while dragging)
+        key = round(self.value, 2)
+        if key != self._cached_val:
+            self._cached_surf = font.render(f"{self.label}: {self.value:.2f}",
+                                            True, TEXT_COLOR)
+            self._cached_val = key
+        screen.blit(self._cached_surf, (self.rect.x, self.rect.y - 25))
+
+    def handle_event(self, event, mx, my):
+        # Cheap reject: unless mid-drag, events away from this slider
+        # can't affect it
+        if not self.dragging and not self.hit_rect.collidepoint(mx, my):
+            return False
 
-    def handle_event(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN:
             if event.button == 1:
-                mouse_pos = pygame.mouse.get_pos()
                 handle_pos = (self.handle_x, self.rect.y + self.rect.height // 2)
-                if (mouse_pos[0] - handle_pos[0]) ** 2 + (mouse_pos[1] - handle_pos[1]) ** 2 <= self.handle_radius ** 2:
+                if (mx - handle_pos[0]) ** 2 + (my - handle_pos[1]) ** 2 <= self.handle_radius ** 2:
                     self.dragging = True
         elif event.type == pygame.MOUSEBUTTONUP:
             if event.button == 1:
                 self.dragging = False
         elif event.type == pygame.MOUSEMOTION:
             if self.dragging:
-                mouse_x, _ = pygame.mouse.get_pos()
                 # Constrain to slider bounds
-                mouse_x = max(self.rect.x, min(mouse_x, self.rect.x + self.rect.width))
+                mouse_x = max(self.rect.x, min(mx, self.rect.x + self.rect.width))
                 self.handle_x = mouse_x
                 # Calculate new value
                 self.value = self.min_val + (mouse_x - self.rect.x) / self.rect.width * (self.max_val - self.min_val)
@@ -272,12 +848,13 @@ class Slider:
         return False
 
 
-def draw_info(screen):
-    # Display title
-    title = title_font.render("Boids Algorithm - Flocking Simulation", True, TEXT_COLOR)
-    screen.blit(title, (20, 15))
+def _bake_info_panel():
+    # Title and instructions are static, so rasterize them once at
+    # startup; draw_info then costs two blits instead of ten font
+    # renders per frame
+    title = title_font.render("Boids Algorithm - Flocking Simulation",
+                              True, TEXT_COLOR)
 
-    # Display instructions
     instructions = [
         "Warning: !!!Please switch your input method to English!!!",
         "Controls:",
@@ -289,14 +866,27 @@ def draw_info(screen):
         "- V: Toggle visuals",
         "- ESC: Quit"
     ]
+    lines = [font.render(text, True, TEXT_COLOR) for text in instructions]
+    panel = pygame.Surface((max(line.get_width() for line in lines),
+                            30 * len(lines)), pygame.SRCALPHA)
+    for i, line in enumerate(lines):
+        panel.blit(line, (0, i * 30))
+    return title, panel
 
-    for i, text in enumerate(instructions):
-        text_surface = font.render(text, True, TEXT_COLOR)
-        screen.blit(text_surface, (WIDTH - 600, 60 + i * 30))
+
+TITLE_SURF, INFO_SURF = _bake_info_panel()
+
+
+def draw_info(screen):
+    # Display title
+    screen.blit(TITLE_SURF, (20, 15))
+
+    # Display instructions
+    screen.blit(INFO_SURF, (WIDTH - 600, 60))
 
 
 def main(params=None):
-    boids = create_boids(None)
+    flock = create_boids(None)
     clock = pygame.time.Clock()
 
     # Create sliders for parameters
@@ -318,9 +908,10 @@ def main(params=None):
     ]
 
     # Add some initial randomness
-    for boid in boids:
-        angle = random.uniform(0, 2 * math.pi)
-        boid.velocity = np.array([math.cos(angle), math.sin(angle)]) * params["max_speed"]
+    if flock.count:
+        angles = np.random.uniform(0, 2 * math.pi, flock.count).astype(np.float32)
+        flock.velocities = np.stack([np.cos(angles), np.sin(angles)],
+                                    axis=1) * params["max_speed"]
 
     running = True
     show_visuals = True
@@ -334,14 +925,14 @@ def main(params=None):
                     running = False
                 elif event.key == pygame.K_SPACE:
                     # Space to add new boid
-                    boids.append(Boid(random.randint(50, WIDTH - 50),
-                                      random.randint(50, HEIGHT - 50)))
+                    flock.add(random.randint(50, WIDTH - 50),
+                              random.randint(50, HEIGHT - 50))
                 elif event.key == pygame.K_v:
                     # Toggle visuals
                     show_visuals = not show_visuals
                 elif event.key == pygame.K_c:
                     # Clear all boids
-                    boids = []
+                    flock.clear()
                 elif event.key == pygame.K_r:
                     # Reset parameters
                     params = {
@@ -364,13 +955,18 @@ def main(params=None):
                     x, y = pygame.mouse.get_pos()
                     # Only add if not clicking on slider area
                     if y > 500 or x > 350:
-                        boids.append(Boid(x, y))
+                        flock.add(x, y)
 
-            # Handle slider events
+            # Handle slider events; mouse events already carry their
+            # position, so fetch it once instead of one
+            # pygame.mouse.get_pos() call per slider
             param_changed = False
-            for slider in sliders:
-                if slider.handle_event(event):
-                    param_changed = True
+            if event.type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP,
+                              pygame.MOUSEMOTION):
+                mx, my = event.pos
+                for slider in sliders:
+                    if slider.handle_event(event, mx, my):
+                        param_changed = True
 
             # Update params if any slider changed
             if param_changed:
@@ -385,24 +981,15 @@ def main(params=None):
         # Fill background
         screen.fill(BACKGROUND)
 
-        # Update and draw boids
-        for boid in boids:
-            boid.flock(boids)
-            boid.update()
-            if show_visuals:
-                boid.draw(screen)
-            else:
-                # Draw simplified arrow without visuals
-                angle = math.atan2(boid.velocity[1], boid.velocity[0])
-                length = 15
-                end_point = (
-                    boid.position[0] + math.cos(angle) * length,
-                    boid.position[1] + math.sin(angle) * length
-                )
-                pygame.draw.line(screen, ARROW_COLOR,
-                                 boid.position.astype(int),
-                                 end_point, 2)
-                pygame.draw.circle(screen, ARROW_COLOR, boid.position.astype(int), 3)
+        # Update and draw boids; the perception/neighbor overlay follows
+        # the boid closest to the mouse
+        flock.flock_all()
+        flock.update_all()
+        hover_idx = -1
+        if show_visuals:
+            mx, my = pygame.mouse.get_pos()
+            hover_idx = flock.nearest_to(mx, my)
+        flock.draw_all(screen, show_visuals, hover_idx)
 
         # Draw sliders
         for slider in sliders:
@@ -412,7 +999,7 @@ def main(params=None):
         draw_info(screen)
 
         # Draw boid count
-        count_text = font.render(f"Boids: {len(boids)}", True, TEXT_COLOR)
+        count_text = font.render(f"Boids: {flock.count}", True, TEXT_COLOR)
         screen.blit(count_text, (20, HEIGHT - 40))
 
         # Draw toggle hint
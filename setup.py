@@ -0,0 +1,22 @@
+# Builds the optional Cython flocking kernel:
+#
+#     python setup.py build_ext --inplace
+#
+# Boids.py picks the compiled kernel up automatically when numba is not
+# installed; without either, the pure NumPy path is used.
+
+from setuptools import Extension, setup
+from Cython.Build import cythonize
+
+extensions = [
+    Extension(
+        "flock_kernel",
+        ["flock_kernel.pyx"],
+        extra_compile_args=["-O3", "-ffast-math", "-march=native"],
+    )
+]
+
+setup(
+    name="flock_kernel",
+    ext_modules=cythonize(extensions),
+)